@@ -0,0 +1,72 @@
+"""Persistent author cache for survival."""
+
+import sqlite3
+import time
+from typing import Dict, Any, Iterable
+
+# Cached author info older than this many seconds is fetched again
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+# Stay well below SQLite's limit on bound parameters per statement
+_QUERY_CHUNK = 500
+
+def open_author_cache(path: str) -> sqlite3.Connection:
+    """Open (creating if needed) an author cache database.
+
+    Args:
+        path: Path to the SQLite database file
+
+    Returns:
+        Open database connection
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS authors ("
+        "author_id TEXT PRIMARY KEY, "
+        "username TEXT, "
+        "follower_count INTEGER, "
+        "fetched_at INTEGER)"
+    )
+    return conn
+
+def load_authors(conn: sqlite3.Connection, author_ids: Iterable[str], ttl: int = DEFAULT_TTL) -> Dict[str, Dict[str, Any]]:
+    """Look up cached author info that is still fresh.
+
+    Args:
+        conn: Author cache connection
+        author_ids: Author IDs to look up
+        ttl: Maximum age of a cached entry in seconds
+
+    Returns:
+        Author info by ID, in the same shape the enrich command writes
+    """
+    cutoff = int(time.time()) - ttl
+    ids = list(author_ids)
+    authors = {}
+    for i in range(0, len(ids), _QUERY_CHUNK):
+        chunk = ids[i:i + _QUERY_CHUNK]
+        rows = conn.execute(
+            f"SELECT author_id, username, follower_count FROM authors "
+            f"WHERE fetched_at >= ? AND author_id IN ({','.join('?' * len(chunk))})",
+            [cutoff, *chunk]
+        )
+        for author_id, username, follower_count in rows:
+            authors[author_id] = {
+                'follower_count': follower_count,
+                'username': username
+            }
+    return authors
+
+def store_authors(conn: sqlite3.Connection, authors: Dict[str, Dict[str, Any]]) -> None:
+    """Save freshly fetched author info to the cache.
+
+    Args:
+        conn: Author cache connection
+        authors: Author info by ID, as returned by load_authors
+    """
+    now = int(time.time())
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO authors (author_id, username, follower_count, fetched_at) VALUES (?, ?, ?, ?)",
+            [(author_id, info['username'], info['follower_count'], now) for author_id, info in authors.items()]
+        )
@@ -1,41 +1,163 @@
 import argparse
-import json
+import functools
+import os
+import queue
+import threading
 import time
-from typing import Any, Dict, Optional, List
-from . import x
+from typing import Any, Callable, Dict, Optional, List
 import sys
-from datetime import datetime
-from tqdm import tqdm
-from . import convert
+from . import jsonl
 
-def format_output(command: str, query: str, args: Dict[str, Any], error: Optional[str], result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-    """Format command output in a standard structure.
+# Minimum seconds between crawl progress lines
+PROGRESS_INTERVAL = 1.0
+
+# Concurrent user lookups made by the enrich command
+ENRICH_WORKERS = 8
+
+# Bytes of JSONL output held in memory before writing to disk
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Crawl steps allowed to wait for the writer thread
+WRITE_QUEUE_SIZE = 64
+
+# Constant leading bytes of crawl JSONL records, formatted with the timestamp
+CRAWL_STEP_PREFIX = b'{"type":"crawl_step","timestamp":%d,"pagination":'
+POST_PREFIX = b'{"type":"post","timestamp":%d,"data":'
+
+def write_all(fd: int, data: bytes) -> None:
+    """Write all of data to a file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def serialize_crawl_step(ts: int, posts: List[Dict[str, Any]], pagination: Dict[str, Any], rate_limit: Any) -> bytes:
+    """Serialize one crawl step as JSONL: a crawl_step line, then one line per post."""
+    # Serialize only the parts that change; the keys are precomputed bytes
+    parts = [
+        CRAWL_STEP_PREFIX % ts,
+        jsonl.dumps(pagination),
+        b',"rate_limit":',
+        jsonl.dumps(rate_limit),
+        b"}\n"
+    ]
+    
+    # Post records only differ in their data
+    post_prefix = POST_PREFIX % ts
+    for post in posts:
+        parts += (post_prefix, jsonl.dumps(post), b"}\n")
+    return b"".join(parts)
+
+def write_crawl_steps(
+    fd: int,
+    compressed: bool,
+    steps: queue.Queue,
+    errors: List[Exception],
+    save_state: Optional[Callable[[Optional[str], Optional[str]], None]] = None
+) -> None:
+    """Serialize queued crawl steps and append them to a file descriptor.
+    
+    Runs on the crawl writer thread. Steps are buffered in memory and written
+    and synced to disk once no further steps are waiting, or once
+    WRITE_BUFFER_SIZE bytes accumulate, so a crash loses at most the pages
+    still queued. A None item ends the stream and writes whatever is left.
+    Compressed output gets one gzip member per write. The first error is
+    appended to errors and later steps are discarded.
+    
+    After every sync the crawl position of the last step written is passed
+    to save_state, so a saved position never points past pages that did not
+    reach the file.
+    
+    Args:
+        fd: File descriptor opened for appending
+        compressed: Gzip each write
+        steps: Queue of (timestamp, posts, pagination, rate_limit, position)
+            tuples, where position is the (since_id, next_token) to resume from
+        errors: List shared with the crawl loop for reporting failures
+        save_state: Called with the synced position, if given
+    """
+    buf = bytearray()
+    position = None
+    
+    def flush() -> None:
+        nonlocal position
+        if buf:
+            write_all(fd, jsonl.compress(buf) if compressed else buf)
+            buf.clear()
+            os.fsync(fd)
+        if save_state is not None and position is not None:
+            save_state(*position)
+            position = None
+    
+    while (step := steps.get()) is not None:
+        if errors:
+            continue
+        try:
+            *record, step_position = step
+            buf += serialize_crawl_step(*record)
+            position = step_position
+            # Sync once per page, batching pages while the writer lags behind
+            if steps.empty() or len(buf) >= WRITE_BUFFER_SIZE:
+                flush()
+        except Exception as e:
+            errors.append(e)
+    
+    # After an error the buffer may already be partly written
+    if not errors:
+        try:
+            flush()
+        except Exception as e:
+            errors.append(e)
+
+def parse_crawl_step(line: bytes) -> Optional[Dict[str, Any]]:
+    """Decode a crawl JSONL line if it holds a crawl_step message."""
+    if b'"crawl_step"' not in line:
+        return None
+    try:
+        data = jsonl.loads(line)
+    except jsonl.JSONDecodeError:
+        return None  # Skip invalid JSON lines
+    if isinstance(data, dict) and data.get('type') == 'crawl_step':
+        return data
+    return None
+
+def find_last_crawl_step(path: str) -> Optional[Dict[str, Any]]:
+    """Find the last crawl_step message in a crawl JSONL file.
+    
+    Plain files are scanned backward from the end. Compressed files can only
+    be read forward, so every line is checked and the last match is kept.
     
     Args:
-        command: The command being executed (e.g. 'x/search-recent')
-        args: Dictionary of command arguments
-        error: Error message (if failed)
-        result: The command result data (if successful)
+        path: Path to the crawl JSONL file, optionally gzip-compressed
         
     Returns:
-        dict: Standardized output format
+        The last crawl_step message, or None if there is none
     """
-    return {
-        "command": command,
-        "query": query,
-        "args": args,
-        "executed_at": int(time.time()),
-        "errors": error,
-        "result": result
-    }
+    if jsonl.is_gzip(path):
+        last_crawl_step = None
+        with jsonl.open_file(path, 'rb') as f:
+            for line in jsonl.iter_lines(f):
+                last_crawl_step = parse_crawl_step(line) or last_crawl_step
+        return last_crawl_step
+    
+    for line in jsonl.reverse_lines(path):
+        crawl_step = parse_crawl_step(line)
+        if crawl_step:
+            return crawl_step
+    return None
 
 def x_search_recent(args: argparse.Namespace) -> None:
     """Search for recent posts on X."""
-    args_dict = {k: v for k, v in vars(args).items() if v is not None and k not in ("func", "outfile")}
+    from . import x
+
+    args_dict = {"max_results": args.max_results}
+    if args.next_token is not None:
+        args_dict["next_token"] = args.next_token
+    if args.since_id is not None:
+        args_dict["since_id"] = args.since_id
     output_path = args.outfile
     
-    query = " ".join(args_dict.pop("query", []))
-    pretty = args_dict.pop("pretty", False)
+    query = args.query[0] if len(args.query) == 1 else " ".join(args.query)
+    pretty = args.pretty
     
     try:
         posts, pagination, rate_limit = x.search_recent_posts(query, **args_dict)
@@ -44,86 +166,101 @@ def x_search_recent(args: argparse.Namespace) -> None:
             "pagination": pagination,
             "rate_limit": rate_limit
         }
-        output = format_output("x/search-recent", query, args_dict, None, result)
+        error = None
     except Exception as e:
-        output = format_output("x/search-recent", query, args_dict, str(e), None)
+        result = None
+        error = str(e)
+    
+    output = {
+        "command": "x/search-recent",
+        "query": query,
+        "args": args_dict,
+        "executed_at": int(time.time()),
+        "errors": error,
+        "result": result
+    }
     
+    payload = jsonl.dumps(output, pretty=pretty)
     if output_path:
-        if pretty:
-            with open(output_path, "w") as f:
-                json.dump(output, f, indent=4, sort_keys=True)
-        else:
-            with open(output_path, "w") as f:
-                json.dump(output, f)
+        with open(output_path, "wb") as f:
+            f.write(payload)
     else:
-        if pretty:
-            print(json.dumps(output, indent=4, sort_keys=True))
-        else:
-            print(json.dumps(output))
+        sys.stdout.buffer.write(payload + b"\n")
 
 def x_crawl(args: argparse.Namespace) -> None:
     """Crawl recent posts on X, paginating through all available results."""
+    from . import x
+
     if not args.outfile:
         raise ValueError("--outfile is required for crawl command")
     
-    # Convert args to dict
-    args_dict = {k: v for k, v in vars(args).items() if v is not None and k not in ("func", "outfile", "query", "previous")}
-    query = " ".join(args.query)
+    # Collect the crawl parameters
+    args_dict = {"max_results": args.max_results, "delay": args.delay}
+    if args.next_token is not None:
+        args_dict["next_token"] = args.next_token
+    if args.since_id is not None:
+        args_dict["since_id"] = args.since_id
+    query = args.query[0] if len(args.query) == 1 else " ".join(args.query)
     
     # If --previous is specified, get continuation parameters
     if args.previous:
         try:
-            # Read the file to find the last crawl_step message
-            last_crawl_step = None
-            with open(args.previous, 'r') as f:
-                for line in f:
-                    try:
-                        data = json.loads(line)
-                        if data.get('type') == 'crawl_step':
-                            last_crawl_step = data
-                    except json.JSONDecodeError:
-                        continue  # Skip invalid JSON lines
-                
-                if not last_crawl_step:
-                    raise ValueError("No crawl_step messages found in previous file")
-                
-                pagination = last_crawl_step.get('pagination', {})
-                args_dict['since_id'] = pagination.get('newest_id')
-                args_dict['next_token'] = pagination.get('next_token')
+            last_crawl_step = find_last_crawl_step(args.previous)
+            if not last_crawl_step:
+                raise ValueError("No crawl_step messages found in previous file")
+            
+            pagination = last_crawl_step.get('pagination', {})
+            args_dict['since_id'] = pagination.get('newest_id')
+            args_dict['next_token'] = pagination.get('next_token')
                 
         except Exception as e:
             raise RuntimeError(f"Error reading previous file: {str(e)}")
     
-    # Open output file
-    with open(args.outfile, "a") as f:
+    # Otherwise resume from the --state file. The position is saved by the
+    # writer thread once the pages before it are synced to --outfile
+    if args.state is not None and "next_token" not in args_dict and "since_id" not in args_dict:
+        state = x.load_crawl_state(args.state)
+        args_dict["next_token"] = state.get("next_token")
+        args_dict["since_id"] = state.get("since_id")
+    since_id = args_dict.get("since_id")
+    
+    # Print progress to stderr, throttled unless we are rate limited
+    args_dict["progress"] = x.ProgressReporter(log_interval=PROGRESS_INTERVAL)
+    
+    # Hand pages to a writer thread so serialization and disk writes overlap
+    # with waiting on the API
+    fd = os.open(args.outfile, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    steps = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    errors = []
+    writer = threading.Thread(
+        target=write_crawl_steps,
+        args=(fd, jsonl.is_gzip(args.outfile), steps, errors),
+        kwargs={"save_state": functools.partial(x.save_crawl_state, args.state) if args.state else None},
+        daemon=True
+    )
+    writer.start()
+    try:
         # Start crawling
         for posts, pagination, rate_limit in x.crawl(
             query=query,
             **args_dict
         ):
-            # Write crawl metadata
-            crawl_msg = {
-                "type": "crawl_step",
-                "timestamp": int(time.time()),
-                "pagination": pagination,
-                "rate_limit": rate_limit
-            }
-            f.write(json.dumps(crawl_msg) + "\n")
+            if errors:
+                break
             
-            # Write each post
-            for post in posts:
-                post_msg = {
-                    "type": "post",
-                    "timestamp": int(time.time()),
-                    "data": post
-                }
-                f.write(json.dumps(post_msg) + "\n")
+            # Track the position to resume from after this page, as crawl() does
+            since_id = pagination.get("newest_id") or since_id
+            position = (since_id, pagination.get("next_token"))
             
-            # Print progress to stderr
-            print(f"Found {len(posts)} posts (total: {pagination.get('result_count', 0)})", file=sys.stderr)
-            if rate_limit.get("remaining", 0) == 0:
-                reset = rate_limit.get("reset", 0)
-                print(f"Rate limited, reset at {datetime.fromtimestamp(reset)}", file=sys.stderr)
+            # All posts in a step come from the same request
+            steps.put((int(time.time()), posts, pagination, rate_limit, position))
+    finally:
+        steps.put(None)
+        writer.join()
+        os.close(fd)
+    
+    if errors:
+        raise RuntimeError(f"Error writing crawl output: {str(errors[0])}")
 
 def x_dump_crawl(args: argparse.Namespace) -> None:
     """Convert a crawl JSONL file to CSV format with X.com links."""
@@ -132,6 +269,8 @@ def x_dump_crawl(args: argparse.Namespace) -> None:
     if not args.outfile:
         raise ValueError("--outfile is required for dump command")
 
+    from . import convert
+
     try:
         num_posts = convert.jsonl_to_csv(args.infile, args.outfile)
         print(f"Successfully converted {num_posts} posts to CSV", file=sys.stderr)
@@ -140,6 +279,8 @@ def x_dump_crawl(args: argparse.Namespace) -> None:
 
 def x_numfollowers(args: argparse.Namespace) -> None:
     """Get follower count for a user by ID or username."""
+    from . import x
+
     try:
         user_data, rate_limit = x.get_follower_count(args.identifier, args.username)
         
@@ -154,16 +295,17 @@ def x_numfollowers(args: argparse.Namespace) -> None:
             "rate_limit": rate_limit
         }
         
-        if args.pretty:
-            print(json.dumps(output, indent=4, sort_keys=True))
-        else:
-            print(json.dumps(output))
+        sys.stdout.buffer.write(jsonl.dumps(output, pretty=args.pretty) + b"\n")
             
     except Exception as e:
         raise RuntimeError(f"Error getting follower count: {str(e)}")
 
 def x_enrich_crawl(args: argparse.Namespace) -> None:
     """Enrich crawl data with author information."""
+    from concurrent.futures import ThreadPoolExecutor
+    from . import x
+    from datetime import datetime
+
     if not args.infile:
         raise ValueError("--infile is required for enrich command")
     if not args.outfile:
@@ -172,60 +314,106 @@ def x_enrich_crawl(args: argparse.Namespace) -> None:
     try:
         # First pass: collect all unique author IDs
         author_ids = set()
-        with open(args.infile, 'r') as f:
-            for line in f:
+        with jsonl.open_file(args.infile, 'rb') as f:
+            for line in jsonl.iter_lines(f):
                 try:
-                    data = json.loads(line)
-                    if data.get('type') == 'post' and 'author_id' in data.get('data', {}):
-                        author_ids.add(data['data']['author_id'])
-                except json.JSONDecodeError:
+                    data = jsonl.loads(line)
+                    if data.get('type') == 'post':
+                        author_id = data['data'].get('author_id')
+                        if author_id:
+                            author_ids.add(author_id)
+                except jsonl.JSONDecodeError:
                     continue
 
-        # Batch retrieve user information
+        # Reuse author info saved by earlier runs
         author_info = {}
+        author_cache = None
+        if not args.no_cache:
+            import sqlite3
+            from . import cache
+            try:
+                author_cache = cache.open_author_cache(args.cache or args.infile + '.authorcache')
+                ttl = cache.DEFAULT_TTL if args.cache_ttl is None else args.cache_ttl
+                author_info = cache.load_authors(author_cache, author_ids, ttl=ttl)
+                print(f"Found {len(author_info)} authors in cache", file=sys.stderr)
+            except sqlite3.Error as e:
+                # Only a cache the user asked for is worth failing over
+                if args.cache:
+                    raise
+                print(f"Warning: not using the author cache: {str(e)}", file=sys.stderr)
+                if author_cache is not None:
+                    author_cache.close()
+                    author_cache = None
+
+        # Batch retrieve user information, several batches at a time
         batch_size = 100  # X API allows up to 100 users per request
-        for i in range(0, len(author_ids), batch_size):
-            batch = list(author_ids)[i:i + batch_size]
-            users, rate_limit = x.get_users_batch(batch)
-            
-            # Store user info by ID
-            for user in users:
-                author_info[user['id']] = {
-                    'follower_count': user.get('public_metrics', {}).get('followers_count'),
-                    'username': user.get('username')
-                }
-            
-            # Print progress
-            print(f"Retrieved info for {len(users)} users (remaining: {rate_limit['remaining']})", file=sys.stderr)
-            
-            # Respect rate limits
-            if rate_limit['remaining'] == 0:
-                reset = rate_limit['reset']
-                print(f"Rate limited, reset at {datetime.fromtimestamp(reset)}", file=sys.stderr)
-                time.sleep(max(0, reset - time.time()) + 1)
+        ids = [author_id for author_id in author_ids if author_id not in author_info]
+        batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+        remaining = ENRICH_WORKERS  # Unknown until the first response
+        reset = 0
+        with ThreadPoolExecutor(max_workers=ENRICH_WORKERS) as pool:
+            i = 0
+            while i < len(batches):
+                # Respect rate limits
+                if remaining <= 0:
+                    print(f"Rate limited, reset at {datetime.fromtimestamp(reset)}", file=sys.stderr)
+                    time.sleep(max(0, reset - time.time()) + 1)
+                    remaining = ENRICH_WORKERS
+                
+                # Never put more requests in flight than the quota allows
+                wave = batches[i:i + min(ENRICH_WORKERS, remaining)]
+                i += len(wave)
+                remaining = None
+                fetched = {}
+                for users, rate_limit in pool.map(x.get_users_batch, wave):
+                    # Store user info by ID
+                    for user in users:
+                        fetched[user['id']] = {
+                            'follower_count': user.get('public_metrics', {}).get('followers_count'),
+                            'username': user.get('username')
+                        }
+                    
+                    # Print progress
+                    print(f"Retrieved info for {len(users)} users (remaining: {rate_limit.remaining})", file=sys.stderr)
+                    
+                    # The lowest quota reported in the wave is the current one
+                    if remaining is None or rate_limit.remaining < remaining:
+                        remaining = rate_limit.remaining
+                    reset = max(reset, rate_limit.reset)
+                
+                author_info.update(fetched)
+                if author_cache is not None:
+                    try:
+                        cache.store_authors(author_cache, fetched)
+                    except sqlite3.Error as e:
+                        if args.cache:
+                            raise
+                        print(f"Warning: not using the author cache: {str(e)}", file=sys.stderr)
+                        author_cache.close()
+                        author_cache = None
+
+        if author_cache is not None:
+            author_cache.close()
 
         # Second pass: enrich the data
-        with open(args.infile, 'r') as infile, open(args.outfile, 'w') as outfile:
-            for line in infile:
+        with jsonl.open_file(args.infile, 'rb') as infile, jsonl.open_file(args.outfile, 'wb', buffering=WRITE_BUFFER_SIZE) as outfile:
+            for line in jsonl.iter_lines(infile):
                 try:
-                    data = json.loads(line)
+                    data = jsonl.loads(line)
                     if data.get('type') == 'post':
                         author_id = data['data'].get('author_id')
                         if author_id in author_info:
                             data['author_data'] = author_info[author_id]
-                    outfile.write(json.dumps(data) + '\n')
-                except json.JSONDecodeError:
+                    outfile.write(jsonl.dumps_line(data))
+                except jsonl.JSONDecodeError:
                     continue
 
         print(f"Successfully enriched data with info for {len(author_info)} authors", file=sys.stderr)
     except Exception as e:
         raise RuntimeError(f"Error enriching data: {str(e)}")
 
-def generate_argument_parser():
-    parser = argparse.ArgumentParser(description="survival")
-    subparsers = parser.add_subparsers(title="commands")
-    
-    x_parser = subparsers.add_parser("x", help="X (Twitter) related commands")
+def add_x_commands(x_parser: argparse.ArgumentParser) -> None:
+    """Add the `x` subcommands to their parent parser."""
     x_subparsers = x_parser.add_subparsers(title="subcommands")
     
     search_parser = x_subparsers.add_parser(
@@ -260,6 +448,8 @@ def generate_argument_parser():
         
         To continue a previous crawl, use --previous to specify the last JSONL file.
         The command will automatically extract the continuation parameters.
+        Alternatively, --state keeps the crawl position in a small file that is
+        updated after every page and read back on the next run.
         """
     )
     crawl_parser.add_argument("query", nargs='+', help="Search query")
@@ -267,11 +457,26 @@ def generate_argument_parser():
     crawl_parser.add_argument("--max-results", type=int, default=100, help="Maximum results per request (10-100)")
     crawl_parser.add_argument("--next-token", help="Token for retrieving the next page of results")
     crawl_parser.add_argument("--since-id", help="Only return posts newer than this post ID")
-    crawl_parser.add_argument("--delay", type=int, default=10, help="Seconds to wait between requests")
+    crawl_parser.add_argument("--delay", type=int, default=None, help="Longest wait in seconds between requests (default: pace from the rate limit headers)")
     crawl_parser.add_argument("--previous", type=str, help="Previous JSONL file to continue from")
+    crawl_parser.add_argument("--state", type=str, help="File to save the crawl position to after every page, and to resume from")
     crawl_parser.set_defaults(func=x_crawl)
 
-    dump_parser = subparsers.add_parser("dump", help="Dump data in various formats")
+    numfollowers_parser = x_subparsers.add_parser(
+        "numfollowers",
+        help="Get follower count for a user",
+        description="""
+        Get follower count for a user by ID or username.
+        Returns user data including follower count and rate limit info.
+        """
+    )
+    numfollowers_parser.add_argument("identifier", help="User ID or username")
+    numfollowers_parser.add_argument("--username", action="store_true", help="Treat identifier as username instead of ID")
+    numfollowers_parser.add_argument("--pretty", action="store_true", help="Pretty print the output")
+    numfollowers_parser.set_defaults(func=x_numfollowers)
+
+def add_dump_commands(dump_parser: argparse.ArgumentParser) -> None:
+    """Add the `dump` subcommands to their parent parser."""
     dump_subparsers = dump_parser.add_subparsers(title="subcommands")
 
     dump_crawl_parser = dump_subparsers.add_parser(
@@ -286,19 +491,33 @@ def generate_argument_parser():
     dump_crawl_parser.add_argument("--outfile", type=str, required=True, help="Output CSV file path")
     dump_crawl_parser.set_defaults(func=x_dump_crawl)
 
-    numfollowers_parser = x_subparsers.add_parser(
-        "numfollowers",
-        help="Get follower count for a user",
-        description="""
-        Get follower count for a user by ID or username.
-        Returns user data including follower count and rate limit info.
-        """
-    )
-    numfollowers_parser.add_argument("identifier", help="User ID or username")
-    numfollowers_parser.add_argument("--username", action="store_true", help="Treat identifier as username instead of ID")
-    numfollowers_parser.add_argument("--pretty", action="store_true", help="Pretty print the output")
-    numfollowers_parser.set_defaults(func=x_numfollowers)
+def add_enrich_arguments(enrich_parser: argparse.ArgumentParser) -> None:
+    """Add the `enrich` arguments to its parser."""
+    enrich_parser.add_argument("--infile", type=str, required=True, help="Input JSONL file from crawl")
+    enrich_parser.add_argument("--outfile", type=str, required=True, help="Output JSONL file path")
+    enrich_parser.add_argument("--cache", type=str, help="Author cache database (default: <infile>.authorcache)")
+    enrich_parser.add_argument("--cache-ttl", type=int, help="Seconds before cached author info is fetched again (default: 7 days)")
+    enrich_parser.add_argument("--no-cache", action="store_true", help="Fetch every author instead of using the cache")
+    enrich_parser.set_defaults(func=x_enrich_crawl)
 
+def generate_argument_parser(argv: Optional[List[str]] = None):
+    """Build the CLI argument parser.
+    
+    Only the command tree selected by the first argument is populated, so
+    dispatching a single command does not pay for building every subparser.
+    The full tree is built for top-level help or an unknown command.
+    
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    parser = argparse.ArgumentParser(description="survival")
+    subparsers = parser.add_subparsers(title="commands")
+    
+    x_parser = subparsers.add_parser("x", help="X (Twitter) related commands")
+    dump_parser = subparsers.add_parser("dump", help="Dump data in various formats")
     enrich_parser = subparsers.add_parser(
         "enrich",
         help="Enrich crawl data with author information",
@@ -310,20 +529,34 @@ def generate_argument_parser():
         3. Enriches the data with author info
         """
     )
-    enrich_parser.add_argument("--infile", type=str, required=True, help="Input JSONL file from crawl")
-    enrich_parser.add_argument("--outfile", type=str, required=True, help="Output JSONL file path")
-    enrich_parser.set_defaults(func=x_enrich_crawl)
+    
+    builders = {
+        "x": lambda: add_x_commands(x_parser),
+        "dump": lambda: add_dump_commands(dump_parser),
+        "enrich": lambda: add_enrich_arguments(enrich_parser),
+    }
+    command = argv[0] if argv else None
+    if command in builders:
+        builders[command]()
+    else:
+        for build in builders.values():
+            build()
 
     parser.set_defaults(func=lambda _: parser.print_help())
     return parser
 
 def main():
-    parser = generate_argument_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    parser = generate_argument_parser(argv)
+    args = parser.parse_args(argv)
     try:
         return args.func(args)
     except Exception as e:
-        print(f"Error: {str(e)}", file=sys.stderr)
+        # Report failures as a JSON line so automation can parse them
+        error = {"error": str(e), "ts": int(time.time())}
+        sys.stderr.flush()
+        sys.stderr.buffer.write(jsonl.dumps(error) + b"\n")
+        sys.stderr.buffer.flush()
         sys.exit(1)
 
 if __name__ == "__main__":
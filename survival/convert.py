@@ -1,8 +1,12 @@
 """Data conversion utilities for survival."""
 
-import json
 import csv
-from typing import List, Dict, Any
+import tempfile
+from typing import Dict, Any, Iterator
+from . import jsonl
+
+# Flattened posts are kept in memory up to this size, then spill to disk
+SCRATCH_MAX_MEMORY = 128 * 1024 * 1024
 
 def flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '_') -> Dict[str, Any]:
     """Flatten a nested dictionary.
@@ -15,20 +19,56 @@ def flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '_') -> Dic
     Returns:
         Flattened dictionary
     """
-    items = []
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(flatten_dict(v, new_key, sep=sep).items())
+    # Walk the nesting with an explicit stack of item iterators, writing
+    # straight into one result dict in the same order as a recursive walk
+    flat = {}
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            if type(v) is dict:
+                stack.append((new_key, iter(v.items())))
+                break
+            flat[new_key] = v
         else:
-            items.append((new_key, v))
-    return dict(items)
+            stack.pop()
+    return flat
+
+def iter_posts(input_path: str) -> Iterator[Dict[str, Any]]:
+    """Stream flattened posts from a crawl JSONL file.
+    
+    Args:
+        input_path: Path to input JSONL file, optionally gzip-compressed
+        
+    Yields:
+        Flattened post data with an X.com link and any author data
+    """
+    with jsonl.open_file(input_path, 'rb') as f:
+        for line in jsonl.iter_lines(f):
+            try:
+                data = jsonl.loads(line)
+            except jsonl.JSONDecodeError:
+                continue
+            if data.get('type') == 'post':
+                post = data.get('data', {})
+                # Add X.com link
+                post['x_link'] = f"https://x.com/i/web/status/{post.get('id')}"
+                # Add author data if present
+                if 'author_data' in data:
+                    post['author_data'] = data['author_data']
+                yield flatten_dict(post)
 
 def jsonl_to_csv(input_path: str, output_path: str) -> int:
     """Convert a JSONL file containing posts to CSV format.
     
+    The input is streamed once to discover the CSV columns while the
+    flattened posts are spooled to a scratch file, which is then streamed
+    into the CSV. The scratch file spills to disk past SCRATCH_MAX_MEMORY,
+    and each post is only parsed out of the crawl file and flattened once.
+    
     Args:
-        input_path: Path to input JSONL file
+        input_path: Path to input JSONL file, optionally gzip-compressed
         output_path: Path to output CSV file
         
     Returns:
@@ -39,41 +79,31 @@ def jsonl_to_csv(input_path: str, output_path: str) -> int:
         RuntimeError: If there are any errors processing the files
     """
     try:
-        # Read all posts from the JSONL file
-        posts = []
-        with open(input_path, 'r') as f:
-            for line in f:
-                try:
-                    data = json.loads(line)
-                    if data.get('type') == 'post':
-                        post = data.get('data', {})
-                        # Add X.com link
-                        post['x_link'] = f"https://x.com/i/web/status/{post.get('id')}"
-                        # Add author data if present
-                        if 'author_data' in data:
-                            post['author_data'] = data['author_data']
-                        # Flatten the post data
-                        post = flatten_dict(post)
-                        posts.append(post)
-                except json.JSONDecodeError:
-                    continue
-
-        if not posts:
-            raise ValueError("No posts found in input file")
-
-        # Write to CSV
-        with open(output_path, 'w', newline='') as f:
-            # Get all possible fields from all posts
+        with tempfile.SpooledTemporaryFile(max_size=SCRATCH_MAX_MEMORY) as scratch:
+            # First pass: get all possible fields from all posts, keeping the
+            # flattened posts for the second pass
             fieldnames = set()
-            for post in posts:
+            num_posts = 0
+            for post in iter_posts(input_path):
                 fieldnames.update(post.keys())
-            fieldnames = sorted(list(fieldnames))
+                scratch.write(jsonl.dumps_line(post))
+                num_posts += 1
+
+            if not num_posts:
+                raise ValueError("No posts found in input file")
 
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(posts)
+            # Second pass: stream the flattened posts to CSV as plain rows
+            fieldnames = sorted(fieldnames)
+            scratch.seek(0)
+            with open(output_path, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                writer.writerows(
+                    [post.get(k, '') for k in fieldnames]
+                    for post in map(jsonl.loads, jsonl.iter_lines(scratch))
+                )
 
-        return len(posts)
+        return num_posts
 
     except Exception as e:
-        raise RuntimeError(f"Error processing file: {str(e)}") 
\ No newline at end of file
+        raise RuntimeError(f"Error processing file: {str(e)}")
@@ -0,0 +1,198 @@
+"""JSON serialization helpers for survival.
+
+Uses orjson when it is installed, then ujson, and falls back to the standard
+library otherwise. Every backend returns compact, UTF-8 encoded bytes so
+callers can write the result straight to a binary file, and serializes
+dataclass instances as JSON objects.
+"""
+
+import dataclasses
+import gzip
+import json
+import mmap
+import os
+from typing import Any, BinaryIO, Iterator, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ujson is only a fallback, so it is not imported when orjson is available
+ujson = None
+if orjson is None:
+    try:
+        import ujson
+    except ImportError:
+        pass
+
+# Raised by loads() for malformed input on every backend
+JSONDecodeError = json.JSONDecodeError
+
+# Files with this suffix are gzip-compressed transparently
+GZIP_SUFFIX = ".gz"
+GZIP_LEVEL = 6
+
+# Block size used when reading a file forward
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Block size used when reading an unmappable file backward
+REVERSE_CHUNK_SIZE = 64 * 1024
+
+def _default(obj: Any) -> Any:
+    """Serialize objects the ujson and standard library backends do not know."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize an object to JSON bytes.
+
+    Args:
+        obj: Object to serialize
+        pretty: Indent the output and sort keys
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        if pretty:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        return orjson.dumps(obj)
+    # ujson drops the fields of default-converted objects when sorting keys,
+    # so pretty output always goes through the standard library instead
+    if ujson is not None and not pretty:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=_default).encode("utf-8")
+    if pretty:
+        return json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False, default=_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize an object to a single newline-terminated JSONL record.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON followed by a newline
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return dumps(obj) + b"\n"
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str.
+
+    Bytes are parsed directly as UTF-8 without decoding to str first.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        The deserialized object
+
+    Raises:
+        JSONDecodeError: If the input is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        try:
+            return ujson.loads(data)
+        except ValueError as e:
+            raise JSONDecodeError(str(e), "", 0) from e
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError as e:
+        raise JSONDecodeError(str(e), "", 0) from e
+
+def is_gzip(path: str) -> bool:
+    """Check whether a path names a gzip-compressed file."""
+    return path.endswith(GZIP_SUFFIX)
+
+def open_file(path: str, mode: str = "rb", buffering: int = -1) -> BinaryIO:
+    """Open a JSONL file in binary mode, decompressing .gz files transparently.
+
+    Args:
+        path: Path to the file
+        mode: Binary file mode ('rb', 'wb' or 'ab')
+        buffering: Buffer size for uncompressed files
+
+    Returns:
+        Binary file object
+    """
+    if is_gzip(path):
+        return gzip.open(path, mode, compresslevel=GZIP_LEVEL)
+    return open(path, mode, buffering=buffering)
+
+def compress(data: bytes) -> bytes:
+    """Compress data into a standalone gzip member.
+
+    Members can be appended to an existing .gz file and are read back as one
+    continuous stream.
+    """
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+def iter_lines(f: BinaryIO) -> Iterator[bytes]:
+    """Iterate over the lines of an open binary file.
+
+    Reads large blocks and splits them on newlines, which avoids the
+    per-line overhead of iterating the file object. Empty lines are dropped
+    here so callers never pay for a failed parse on them.
+
+    Args:
+        f: File opened in binary mode
+
+    Yields:
+        Each non-empty line as bytes, without the trailing newline
+    """
+    tail = b""
+    while chunk := f.read(READ_CHUNK_SIZE):
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        yield from filter(None, lines)
+    if tail:
+        yield tail
+
+def reverse_lines(path: str) -> Iterator[bytes]:
+    """Iterate over the lines of a file from last to first.
+
+    The file is memory-mapped and searched backward for newlines, so finding
+    a record near the end of a large file only touches its tail. Files that
+    cannot be mapped are read backward in fixed-size blocks instead.
+
+    Args:
+        path: Path to the file
+
+    Yields:
+        Each non-empty line as bytes, without the trailing newline
+    """
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files, pipes and some filesystems cannot be mapped
+            yield from _reverse_lines_chunked(f)
+            return
+        with mm:
+            end = len(mm)
+            while end > 0:
+                start = mm.rfind(b"\n", 0, end) + 1
+                if start < end:
+                    yield mm[start:end]
+                end = start - 1
+
+def _reverse_lines_chunked(f: BinaryIO) -> Iterator[bytes]:
+    """Iterate over the lines of an open binary file from last to first."""
+    pos = f.seek(0, os.SEEK_END)
+    tail = b""
+    while pos > 0:
+        start = max(0, pos - REVERSE_CHUNK_SIZE)
+        f.seek(start)
+        lines = (f.read(pos - start) + tail).split(b"\n")
+        pos = start
+        # The first piece is only a whole line once the start is reached
+        tail = lines.pop(0) if pos > 0 else b""
+        for line in reversed(lines):
+            if line:
+                yield line
@@ -1,17 +1,154 @@
+import functools
 import os
+import queue
+import random
 import requests
+import threading
 import time
-import json
 import sys
-from typing import Optional, Dict, Any, Tuple, List, Iterator
-from tqdm import tqdm
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple, List, Iterator, Mapping, Callable
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from . import jsonl
+
+# Shared session so consecutive requests reuse the same TCP/TLS connection
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+))
+
+# X API endpoints
+SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent"
+USERS_URL = "https://api.twitter.com/2/users"
+
+# Connect and read timeouts in seconds, so a stalled connection cannot hang a crawl
+REQUEST_TIMEOUT = (5, 30)
+
+# Longest wait in seconds after a page with no posts that has more pages behind it
+EMPTY_PAGE_DELAY = 2
+
+# Request failures crawl() retries when they come without an HTTP response
+NETWORK_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError
+)
+
+# Response headers carrying the rate limit info
+LIMIT_HEADER = "x-rate-limit-limit"
+REMAINING_HEADER = "x-rate-limit-remaining"
+RESET_HEADER = "x-rate-limit-reset"
+
+# Most user IDs the users endpoint accepts in one request
+MAX_BATCH_IDS = 100
+
+# Exponential backoff for failed crawl requests: the wait doubles from
+# RETRY_BASE_DELAY up to RETRY_MAX_DELAY seconds, plus up to RETRY_JITTER
+# seconds of random jitter, and the error is raised after MAX_RETRIES failures
+RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 300
+RETRY_JITTER = 1.0
+MAX_RETRIES = 8
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Rate limit info reported with an API response.
+    
+    Attributes:
+        limit: Requests allowed in the current window
+        remaining: Requests left in the current window
+        reset: When the window resets, in seconds since epoch
+    """
+    limit: int
+    remaining: int
+    reset: int
+
+def close_session() -> None:
+    """Close the pooled connections held by the shared session."""
+    _SESSION.close()
+
+@functools.cache
+def _auth_headers() -> Dict[str, str]:
+    """Build the request headers carrying the API token.
+    
+    The token is read from the environment on the first successful call and
+    the same headers dict is returned from then on; callers must not modify it.
+    
+    Raises:
+        ValueError: If SURVIVAL_X_API_TOKEN is not set
+    """
+    token = os.environ.get("SURVIVAL_X_API_TOKEN")
+    if not token:
+        raise ValueError("SURVIVAL_X_API_TOKEN environment variable not set")
+    return {
+        "Authorization": f"Bearer {token}"
+    }
+
+def _clamp_max_results(max_results: int) -> int:
+    """Clamp a page size to the 10-100 range the search endpoint accepts."""
+    return min(max(10, max_results), 100)
+
+def _search_params(
+    query: str,
+    max_results: Optional[int],
+    next_token: Optional[str],
+    since_id: Optional[str]
+) -> Dict[str, Any]:
+    """Build the query parameters for a recent search request."""
+    params = {
+        "query": query,
+        "max_results": max_results if 10 <= max_results <= 100 else _clamp_max_results(max_results),
+        "tweet.fields": "created_at,author_id,text"
+    }
+
+    # Add pagination parameters if provided
+    if next_token:
+        params["next_token"] = next_token
+    if since_id:
+        params["since_id"] = since_id
+    return params
+
+def _follower_params(identifier: str, by_username: bool) -> Dict[str, Any]:
+    """Build the query parameters for a single user lookup."""
+    # Build query parameter based on identifier type
+    if by_username:
+        return {
+            "usernames": identifier,
+            "user.fields": "public_metrics"
+        }
+    return {
+        "ids": identifier,
+        "user.fields": "public_metrics"
+    }
+
+def _users_batch_params(user_ids: List[str]) -> Dict[str, Any]:
+    """Build the query parameters for a batched user lookup."""
+    # Join IDs with commas and request public metrics
+    return {
+        "ids": ",".join(user_ids),
+        "user.fields": "public_metrics,username"
+    }
+
+def _rate_limit(headers: Mapping[str, str]) -> RateLimit:
+    """Read the rate limit info from the headers of an API response."""
+    get = headers.get
+    return RateLimit(
+        int(get(LIMIT_HEADER) or 0),
+        int(get(REMAINING_HEADER) or 0),
+        int(get(RESET_HEADER) or 0)
+    )
 
 def search_recent_posts(
     query: str, 
     max_results: Optional[int] = 10,
     next_token: Optional[str] = None,
     since_id: Optional[str] = None
-) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, Any]]:
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any], RateLimit]:
     """Search for recent posts on X about a given topic.
     
     Args:
@@ -26,103 +163,252 @@ def search_recent_posts(
         - meta: Pagination metadata including next_token, newest_id, oldest_id, result_count
         - rate_limit: Rate limit info with limit, remaining, reset (seconds since epoch)
     """
-    token = os.environ.get("SURVIVAL_X_API_TOKEN")
-    if not token:
-        raise ValueError("SURVIVAL_X_API_TOKEN environment variable not set")
-
-    url = "https://api.twitter.com/2/tweets/search/recent"
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-    params = {
-        "query": query,
-        "max_results": min(max(10, max_results), 100),
-        "tweet.fields": "created_at,author_id,text"
-    }
+    headers = _auth_headers()
+    params = _search_params(query, max_results, next_token, since_id)
 
-    # Add pagination parameters if provided
-    if next_token:
-        params["next_token"] = next_token
-    if since_id:
-        params["since_id"] = since_id
-
-    response = requests.get(url, headers=headers, params=params)
+    response = _SESSION.get(SEARCH_URL, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     
-    rate_limit = {
-        "limit": int(response.headers.get("x-rate-limit-limit", 0)),
-        "remaining": int(response.headers.get("x-rate-limit-remaining", 0)),
-        "reset": int(response.headers.get("x-rate-limit-reset", 0))
-    }
+    rate_limit = _rate_limit(response.headers)
     
-    result = response.json()
+    result = jsonl.loads(response.content)
     return result.get("data", []), result.get("meta", {}), rate_limit
 
+class ProgressReporter:
+    """Report crawl progress on stderr, at most once every log_interval seconds.
+    
+    Called by crawl() after every page; rate limited pages are always
+    reported, along with when the rate limit resets. An optional callback
+    receives every update, for plugging in other metrics.
+    """
+
+    def __init__(self, log_interval: float = 5.0, callback: Optional[Callable[[int, RateLimit], None]] = None):
+        """Set up the reporter.
+        
+        Args:
+            log_interval: Minimum seconds between progress lines
+            callback: Called with (total_posts, rate_limit) after every page
+        """
+        self.log_interval = log_interval
+        self.callback = callback
+        self._last_report = None
+
+    def __call__(self, total_posts: int, rate_limit: RateLimit) -> None:
+        if self.callback is not None:
+            self.callback(total_posts, rate_limit)
+        now = time.monotonic()
+        rate_limited = rate_limit.remaining == 0
+        if rate_limited or self._last_report is None or now - self._last_report >= self.log_interval:
+            sys.stderr.write(f"Crawled {total_posts} posts (requests remaining: {rate_limit.remaining})\n")
+            self._last_report = now
+        if rate_limited:
+            from datetime import datetime
+            sys.stderr.write(f"Rate limited, reset at {datetime.fromtimestamp(rate_limit.reset)}\n")
+
+def load_crawl_state(path: str) -> Dict[str, Optional[str]]:
+    """Read the crawl position saved by crawl(), if there is one.
+    
+    Args:
+        path: Path to the state file
+        
+    Returns:
+        Dict with since_id and next_token, empty if the file does not exist
+    """
+    try:
+        with open(path, "rb") as f:
+            return jsonl.loads(f.read())
+    except FileNotFoundError:
+        return {}
+
+def save_crawl_state(path: str, since_id: Optional[str], next_token: Optional[str]) -> None:
+    """Atomically replace the saved crawl position.
+    
+    The state is written to a temporary file next to path and renamed over
+    it, so a crash never leaves a truncated state file behind.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(jsonl.dumps({"since_id": since_id, "next_token": next_token}))
+    os.replace(tmp_path, path)
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Get the HTTP status of a failed request, if it got a response."""
+    response = getattr(error, "response", None)
+    return None if response is None else response.status_code
+
+def _reset_delay(error: Exception) -> Optional[float]:
+    """Get how long a rate limited request asks to wait, if it says."""
+    if _status_code(error) != 429:
+        return None
+    headers = error.response.headers
+    retry_after = headers.get("retry-after")
+    if retry_after and retry_after.isdigit():
+        return int(retry_after)
+    reset = int(headers.get(RESET_HEADER) or 0)
+    if reset:
+        return max(0, reset - time.time()) + 1
+    return None
+
+def _retry_delay(error: Exception, failures: int) -> float:
+    """Pick how long to wait before retrying a failed crawl request.
+    
+    Rate limited requests wait for the window to reset; anything else,
+    including a rate limit without a reset time, backs off exponentially
+    with jitter.
+    """
+    reset_delay = _reset_delay(error)
+    if reset_delay is not None:
+        return reset_delay
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** failures) + random.uniform(0, RETRY_JITTER)
+
+def _count_failure(
+    error: Exception,
+    failures: int,
+    max_retries: int,
+    network_errors: Tuple[type, ...] = NETWORK_ERRORS
+) -> int:
+    """Count a failed crawl request, raising it again when a retry is pointless.
+    
+    Only rate limits, server errors and the network errors listed in
+    network_errors are retried. Anything else, such as a missing token, a
+    bad query or a malformed response, would fail the same way again. Rate
+    limits that say when they reset are waited out without being counted.
+    
+    Returns:
+        The updated number of consecutive failures
+    """
+    status = _status_code(error)
+    if _reset_delay(error) is not None:
+        return failures
+    if status is not None:
+        transient = status == 429 or status >= 500
+    else:
+        transient = isinstance(error, network_errors)
+    failures += 1
+    if not transient or failures > max_retries:
+        raise error
+    return failures
+
+def _pacing_delay(rate_limit: RateLimit, delay: Optional[int], requested_at: float, empty_page: bool = False) -> float:
+    """Pick how long to wait before the next crawl request.
+    
+    Args:
+        rate_limit: Rate limit info from the last response
+        delay: Longest wait in seconds, or None to pace from rate_limit alone
+        requested_at: When the last request was made
+        empty_page: The last page had no posts, so waiting at most
+            EMPTY_PAGE_DELAY seconds is enough
+    """
+    if rate_limit.remaining == 0:
+        return max(0, rate_limit.reset - time.time()) + 10
+    # Spread the remaining quota over the rest of the window
+    interval = max(0, rate_limit.reset - time.time()) / rate_limit.remaining
+    if delay is not None:
+        interval = min(delay, interval)
+    if empty_page:
+        interval = min(EMPTY_PAGE_DELAY, interval)
+    # Time spent on the request and by the caller counts toward the interval
+    return max(0, interval - (time.time() - requested_at))
+
 def crawl(
     query: str,
     max_results: Optional[int] = 100,
     next_token: Optional[str] = None,
     since_id: Optional[str] = None,
-    delay: int = 10
-) -> Iterator[Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, Any]]]:
+    delay: Optional[int] = None,
+    state_path: Optional[str] = None,
+    max_retries: int = MAX_RETRIES,
+    progress: Optional[Callable[[int, RateLimit], None]] = None
+) -> Iterator[Tuple[List[Dict[str, Any]], Dict[str, Any], RateLimit]]:
     """Crawl recent posts on X, paginating through all available results.
     
+    Requests are paced from the rate limit headers, spreading the requests
+    remaining in the current window evenly until it resets.
+    
     Args:
         query: The search query
         max_results: Maximum number of results per request (default: 100)
         next_token: Token for retrieving the next page of results
         since_id: Only return posts newer than this post ID
-        delay: Seconds to wait between requests (default: 10)
+        delay: Longest wait in seconds between requests, or None to pace
+            from the rate limit headers alone
+        state_path: File to save the crawl position to after every page,
+            once the caller asks for the next one. When neither next_token
+            nor since_id is given, the crawl resumes from the position saved
+            there. Callers that write pages out asynchronously should save
+            the position themselves once a page is stored.
+        max_retries: Consecutive failed requests allowed before giving up.
+            Rate limited requests wait for the reset and are not counted.
+        progress: Called with (total_posts, rate_limit) after every page
+            (default: a ProgressReporter)
         
     Yields:
         Tuple of (posts, pagination, rate_limit) for each request
+        
+    Raises:
+        requests.exceptions.HTTPError: On a client error other than a rate
+            limit, or once max_retries consecutive requests have failed
+        ValueError: If SURVIVAL_X_API_TOKEN is not set or a response is
+            not valid JSON
     """
     total_posts = 0
+    failures = 0
+    max_results = _clamp_max_results(max_results)
     
-    with tqdm(desc="Crawling posts", unit="posts") as pbar:
-        while True:
-            try:
-                # Make API request
-                posts, pagination, rate_limit = search_recent_posts(
-                    query,
-                    max_results=max_results,
-                    next_token=next_token,
-                    since_id=since_id
-                )
-                
-                # Update progress
-                total_posts += len(posts)
-                pbar.update(len(posts))
-                pbar.set_postfix({"total": total_posts})
-                
-                # Update pagination
-                if newest_id := pagination.get("newest_id"):
-                    since_id = newest_id
-                if next_token := pagination.get("next_token"):
-                    next_token = next_token
-                else:
-                    next_token = None
-                
-                # Check rate limits and sleep
-                remaining = rate_limit.get("remaining", 0)
-                reset = rate_limit.get("reset", 0)
-                
-                if remaining == 0:
-                    sleep_time = (reset - time.time()) + 10
-                    pbar.set_description(f"Rate limited, waiting {sleep_time:.0f}s")
-                    time.sleep(sleep_time)
-                else:
-                    pbar.set_description(f"Waiting {delay}s between requests")
-                    time.sleep(delay)
+    if state_path and next_token is None and since_id is None:
+        state = load_crawl_state(state_path)
+        next_token = state.get("next_token")
+        since_id = state.get("since_id")
+    
+    if progress is None:
+        progress = ProgressReporter()
+    
+    while True:
+        try:
+            # Make API request
+            requested_at = time.time()
+            posts, pagination, rate_limit = search_recent_posts(
+                query,
+                max_results=max_results,
+                next_token=next_token,
+                since_id=since_id
+            )
+            failures = 0
+            
+            # Update progress, skipping empty pages unless they hit the rate limit
+            total_posts += len(posts)
+            if posts or rate_limit.remaining == 0:
+                progress(total_posts, rate_limit)
+            
+            # Update pagination
+            if newest_id := pagination.get("newest_id"):
+                since_id = newest_id
+            next_token = pagination.get("next_token")
+            
+            # Hand the page over before sleeping, so the caller's work
+            # overlaps with the wait between requests
+            yield posts, pagination, rate_limit
+            
+            # Save the position once the caller has taken the page
+            if state_path:
+                save_crawl_state(state_path, since_id, next_token)
+            
+            # The last page has no next_token
+            if not next_token:
+                break
+            
+            # Check rate limits and sleep
+            time.sleep(_pacing_delay(rate_limit, delay, requested_at, empty_page=not posts))
                 
-                yield posts, pagination, rate_limit
-                    
-            except Exception as e:
-                print(f"Error: {str(e)}", file=sys.stderr)
-                time.sleep(delay)  # Still respect delay on error
-                continue 
+        except Exception as e:
+            # The first retry waits RETRY_BASE_DELAY
+            sleep_time = _retry_delay(e, failures)
+            failures = _count_failure(e, failures, max_retries)
+            print(f"Error: {str(e)}, retrying in {sleep_time:.0f}s", file=sys.stderr)
+            time.sleep(sleep_time)
+            continue 
 
-def get_follower_count(identifier: str, by_username: bool = False) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+def get_follower_count(identifier: str, by_username: bool = False) -> Tuple[Dict[str, Any], RateLimit]:
     """Get follower count for a user by ID or username.
     
     Args:
@@ -138,37 +424,15 @@ def get_follower_count(identifier: str, by_username: bool = False) -> Tuple[Dict
         ValueError: If SURVIVAL_X_API_TOKEN is not set
         requests.exceptions.HTTPError: If API request fails
     """
-    token = os.environ.get("SURVIVAL_X_API_TOKEN")
-    if not token:
-        raise ValueError("SURVIVAL_X_API_TOKEN environment variable not set")
-
-    url = "https://api.twitter.com/2/users"
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
-    
-    # Build query parameter based on identifier type
-    if by_username:
-        params = {
-            "usernames": identifier,
-            "user.fields": "public_metrics"
-        }
-    else:
-        params = {
-            "ids": identifier,
-            "user.fields": "public_metrics"
-        }
+    headers = _auth_headers()
+    params = _follower_params(identifier, by_username)
 
-    response = requests.get(url, headers=headers, params=params)
+    response = _SESSION.get(USERS_URL, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     
-    rate_limit = {
-        "limit": int(response.headers.get("x-rate-limit-limit", 0)),
-        "remaining": int(response.headers.get("x-rate-limit-remaining", 0)),
-        "reset": int(response.headers.get("x-rate-limit-reset", 0))
-    }
+    rate_limit = _rate_limit(response.headers)
     
-    result = response.json()
+    result = jsonl.loads(response.content)
     users = result.get("data", [])
     
     if not users:
@@ -176,44 +440,157 @@ def get_follower_count(identifier: str, by_username: bool = False) -> Tuple[Dict
     
     return users[0], rate_limit 
 
-def get_users_batch(user_ids: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+def get_users_batch(user_ids: List[str]) -> Tuple[List[Dict[str, Any]], RateLimit]:
     """Get information for multiple users in a single request.
     
+    Duplicate IDs are only requested once. More than MAX_BATCH_IDS IDs are
+    split into several requests made one after another.
+    
     Args:
         user_ids: List of user IDs to look up
         
     Returns:
         Tuple containing:
         - users: List of user data including follower counts
-        - rate_limit: Rate limit info with limit, remaining, reset (seconds since epoch)
+        - rate_limit: Rate limit info with limit, remaining, reset (seconds since epoch),
+          from the last request made
         
     Raises:
         ValueError: If SURVIVAL_X_API_TOKEN is not set
         requests.exceptions.HTTPError: If API request fails
     """
-    token = os.environ.get("SURVIVAL_X_API_TOKEN")
-    if not token:
-        raise ValueError("SURVIVAL_X_API_TOKEN environment variable not set")
-
-    url = "https://api.twitter.com/2/users"
-    headers = {
-        "Authorization": f"Bearer {token}"
-    }
+    user_ids = list(dict.fromkeys(user_ids))
+    if len(user_ids) > MAX_BATCH_IDS:
+        users = []
+        for i in range(0, len(user_ids), MAX_BATCH_IDS):
+            batch, rate_limit = get_users_batch(user_ids[i:i + MAX_BATCH_IDS])
+            users += batch
+        return users, rate_limit
     
-    # Join IDs with commas and request public metrics
-    params = {
-        "ids": ",".join(user_ids),
-        "user.fields": "public_metrics,username"
-    }
+    headers = _auth_headers()
+    params = _users_batch_params(user_ids)
 
-    response = requests.get(url, headers=headers, params=params)
+    response = _SESSION.get(USERS_URL, headers=headers, params=params, timeout=REQUEST_TIMEOUT)
     response.raise_for_status()
     
-    rate_limit = {
-        "limit": int(response.headers.get("x-rate-limit-limit", 0)),
-        "remaining": int(response.headers.get("x-rate-limit-remaining", 0)),
-        "reset": int(response.headers.get("x-rate-limit-reset", 0))
-    }
+    rate_limit = _rate_limit(response.headers)
     
-    result = response.json()
-    return result.get("data", []), rate_limit 
\ No newline at end of file
+    result = jsonl.loads(response.content)
+    return result.get("data", []), rate_limit
+
+class FollowerCountBatcher:
+    """Coalesce single-user lookups into batched requests.
+    
+    Lookups made within max_wait seconds of each other are sent together
+    through get_users_batch, up to MAX_BATCH_IDS IDs per request, from a
+    background thread. Results are kept for cache_ttl seconds, so repeated
+    lookups of the same user do not reach the API at all.
+    
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, max_wait: float = 0.05, cache_ttl: float = 60.0, cache_size: int = 10000):
+        """Start the batching thread.
+        
+        Args:
+            max_wait: Seconds to wait for more lookups before sending a batch
+            cache_ttl: Seconds a fetched user is served from the cache
+            cache_size: Maximum number of users kept in the cache
+        """
+        self.max_wait = max_wait
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._pending = queue.Queue()
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "FollowerCountBatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def lookup(self, user_id: str) -> "Future[Tuple[Dict[str, Any], RateLimit]]":
+        """Queue a lookup of one user by ID.
+        
+        Args:
+            user_id: The user's author_id
+            
+        Returns:
+            Future resolving to the same (user_data, rate_limit) tuple as
+            get_follower_count, or raising its errors
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("FollowerCountBatcher is closed")
+            cached = self._cache.get(user_id)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache.move_to_end(user_id)
+                future.set_result(cached[1])
+                return future
+            self._pending.put((user_id, future))
+        return future
+
+    def get_follower_count(self, user_id: str) -> Tuple[Dict[str, Any], RateLimit]:
+        """Look up one user by ID, blocking until its batch is answered."""
+        return self.lookup(user_id).result()
+
+    def close(self) -> None:
+        """Answer the lookups already queued, then stop the batching thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while (item := self._pending.get()) is not None:
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < MAX_BATCH_IDS:
+                try:
+                    item = self._pending.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Put the stop marker back so the outer loop ends after this batch
+                    self._pending.put(None)
+                    break
+                batch.append(item)
+            try:
+                self._send(batch)
+            except Exception as e:
+                # Fail the batch rather than the thread, so later lookups are still answered
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _send(self, batch: List[Tuple[str, Future]]) -> None:
+        # Lookups cancelled by their callers are dropped from the request
+        batch = [(user_id, future) for user_id, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        # Duplicate lookups in one batch share a single ID in the request
+        user_ids = list(dict.fromkeys(user_id for user_id, _ in batch))
+        users, rate_limit = get_users_batch(user_ids)
+
+        results = {user["id"]: (user, rate_limit) for user in users}
+        expires = time.monotonic() + self.cache_ttl
+        with self._lock:
+            for user_id, result in results.items():
+                self._cache[user_id] = (expires, result)
+                self._cache.move_to_end(user_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        for user_id, future in batch:
+            if user_id in results:
+                future.set_result(results[user_id])
+            else:
+                future.set_exception(ValueError(f"No user found with ID: {user_id}"))
@@ -0,0 +1,366 @@
+"""Asynchronous X API client for survival.
+
+Mirrors the lookups in survival.x on top of httpx.AsyncClient, so many
+requests can be in flight at once from a single event loop. Requires the
+optional ``async`` extra (``pip install "survival[async]"``).
+"""
+
+import asyncio
+import sys
+import time
+from typing import Optional, Dict, Any, Tuple, List, AsyncIterator, Callable
+
+try:
+    import httpx
+except ImportError as e:
+    raise ImportError('survival.x_async requires httpx; install it with: pip install "survival[async]"') from e
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+from . import jsonl, x
+
+# Upper bound on requests in flight from aget_users_batch_many
+MAX_CONCURRENCY = 64
+
+# Request failures acrawl() retries when they come without an HTTP response
+NETWORK_ERRORS = (httpx.TransportError,)
+
+# With HTTP/2 many requests share each connection, so only a few are opened
+HTTP2_MAX_CONNECTIONS = 4
+
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared async client, creating it on first use.
+
+    The client keeps its pooled connections between calls. When the h2
+    package is installed it speaks HTTP/2, multiplexing concurrent requests
+    over a handful of connections; otherwise it falls back to a larger pool
+    of HTTP/1.1 connections.
+
+    The client is bound to the event loop it is first used on, so call
+    aclose() before the loop ends if the module is used again from another
+    loop.
+    """
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        if h2 is not None:
+            limits = httpx.Limits(max_connections=HTTP2_MAX_CONNECTIONS, max_keepalive_connections=HTTP2_MAX_CONNECTIONS)
+        else:
+            limits = httpx.Limits(max_connections=MAX_CONCURRENCY, max_keepalive_connections=32)
+        _CLIENT = httpx.AsyncClient(
+            http2=h2 is not None,
+            limits=limits,
+            timeout=httpx.Timeout(x.REQUEST_TIMEOUT[1], connect=x.REQUEST_TIMEOUT[0])
+        )
+    return _CLIENT
+
+async def aclose() -> None:
+    """Close the shared async client and its pooled connections."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+async def asearch_recent_posts(
+    query: str,
+    max_results: Optional[int] = 10,
+    next_token: Optional[str] = None,
+    since_id: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any], x.RateLimit]:
+    """Search for recent posts on X about a given topic.
+
+    Async counterpart of survival.x.search_recent_posts, with the same
+    arguments and return value.
+
+    Raises:
+        ValueError: If SURVIVAL_X_API_TOKEN is not set
+        httpx.HTTPStatusError: If API request fails
+    """
+    headers = x._auth_headers()
+    params = x._search_params(query, max_results, next_token, since_id)
+
+    response = await get_client().get(x.SEARCH_URL, headers=headers, params=params)
+    response.raise_for_status()
+
+    rate_limit = x._rate_limit(response.headers)
+
+    result = jsonl.loads(response.content)
+    return result.get("data", []), result.get("meta", {}), rate_limit
+
+class TokenLimiter:
+    """Pace requests from several concurrent crawls sharing one API token.
+
+    Keeps the rate limit budget reported by the most recent responses and
+    hands out requests from it, spread evenly over the rest of the window
+    as crawl() does for a single query. Once the budget is used up, every
+    caller waits for the window to reset.
+    """
+
+    def __init__(self, max_interval: Optional[float] = None):
+        """Set up an empty budget, learned from the first response.
+
+        Args:
+            max_interval: Longest wait in seconds between requests, or None
+                to pace from the rate limit headers alone
+        """
+        self.max_interval = max_interval
+        self.remaining: Optional[int] = None
+        self.reset = 0
+        self._next_request_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the shared budget allows another request, and reserve it."""
+        async with self._lock:
+            # Responses from other crawls can change the budget during each
+            # sleep, so it is checked again after every one
+            while True:
+                if self.remaining is not None and self.remaining <= 0:
+                    exhausted_reset = self.reset
+                    await asyncio.sleep(max(0, self.reset - time.time()) + 10)
+                    if self.reset == exhausted_reset:
+                        # The new window is learned from the next response
+                        self.remaining = None
+                else:
+                    await asyncio.sleep(max(0, self._next_request_at - time.time()))
+                    if self.remaining is None or self.remaining > 0:
+                        break
+
+            if self.remaining is not None:
+                now = time.time()
+                interval = max(0, self.reset - now) / self.remaining
+                if self.max_interval is not None:
+                    interval = min(self.max_interval, interval)
+                self._next_request_at = now + interval
+                self.remaining -= 1
+
+    def update(self, rate_limit: x.RateLimit) -> None:
+        """Record the budget reported by a response."""
+        if self.remaining is None or rate_limit.reset > self.reset:
+            self.remaining = rate_limit.remaining
+            self.reset = rate_limit.reset
+        elif rate_limit.reset == self.reset:
+            # Responses can arrive out of order; keep the smaller count
+            self.remaining = min(self.remaining, rate_limit.remaining)
+
+async def acrawl(
+    query: str,
+    max_results: Optional[int] = 100,
+    next_token: Optional[str] = None,
+    since_id: Optional[str] = None,
+    delay: Optional[int] = None,
+    state_path: Optional[str] = None,
+    max_retries: int = x.MAX_RETRIES,
+    progress: Optional[Callable[[int, x.RateLimit], None]] = None,
+    limiter: Optional["TokenLimiter"] = None
+) -> AsyncIterator[Tuple[List[Dict[str, Any]], Dict[str, Any], x.RateLimit]]:
+    """Crawl recent posts on X, paginating through all available results.
+
+    Async counterpart of survival.x.crawl, with the same arguments, pacing,
+    retries, progress reporting and saved state. Waits between requests are
+    asyncio sleeps, so other tasks on the loop, such as a consumer writing
+    earlier pages, keep running while the crawl is idle.
+
+    When a limiter is given, it paces the requests instead, sharing one
+    rate limit budget with every other crawl using the same limiter.
+
+    Yields:
+        Tuple of (posts, pagination, rate_limit) for each request
+    """
+    total_posts = 0
+    failures = 0
+    max_results = x._clamp_max_results(max_results)
+
+    if state_path and next_token is None and since_id is None:
+        state = x.load_crawl_state(state_path)
+        next_token = state.get("next_token")
+        since_id = state.get("since_id")
+
+    if progress is None:
+        progress = x.ProgressReporter()
+
+    while True:
+        try:
+            if limiter is not None:
+                await limiter.acquire()
+            requested_at = time.time()
+            posts, pagination, rate_limit = await asearch_recent_posts(
+                query,
+                max_results=max_results,
+                next_token=next_token,
+                since_id=since_id
+            )
+            failures = 0
+            if limiter is not None:
+                limiter.update(rate_limit)
+
+            # Update progress, skipping empty pages unless they hit the rate limit
+            total_posts += len(posts)
+            if posts or rate_limit.remaining == 0:
+                progress(total_posts, rate_limit)
+
+            # Update pagination
+            if newest_id := pagination.get("newest_id"):
+                since_id = newest_id
+            next_token = pagination.get("next_token")
+
+            yield posts, pagination, rate_limit
+
+            # Save the position once the caller has taken the page
+            if state_path:
+                x.save_crawl_state(state_path, since_id, next_token)
+
+            # The last page has no next_token
+            if not next_token:
+                break
+
+            if limiter is None:
+                await asyncio.sleep(x._pacing_delay(rate_limit, delay, requested_at, empty_page=not posts))
+
+        except Exception as e:
+            # The first retry waits RETRY_BASE_DELAY
+            sleep_time = x._retry_delay(e, failures)
+            failures = x._count_failure(e, failures, max_retries, NETWORK_ERRORS)
+            print(f"Error: {str(e)}, retrying in {sleep_time:.0f}s", file=sys.stderr)
+            await asyncio.sleep(sleep_time)
+
+async def multi_crawl(
+    queries: List[str],
+    max_results: Optional[int] = 100,
+    delay: Optional[int] = None,
+    max_retries: int = x.MAX_RETRIES,
+    limiter: Optional[TokenLimiter] = None
+) -> AsyncIterator[Tuple[str, List[Dict[str, Any]], Dict[str, Any], x.RateLimit]]:
+    """Crawl several queries at once under one shared rate limit budget.
+
+    Each query runs in its own acrawl() task, all paced by the same
+    TokenLimiter, and pages are yielded as they arrive from any of them.
+
+    Args:
+        queries: The search queries
+        max_results: Maximum number of results per request (default: 100)
+        delay: Longest wait in seconds between requests across all queries
+        max_retries: Consecutive failed requests allowed per query
+        limiter: Limiter shared with other crawls using the same token
+            (default: a new TokenLimiter)
+
+    Yields:
+        Tuple of (query, posts, pagination, rate_limit) for each request
+
+    Raises:
+        Exception: The first error raised by any of the crawls, after which
+            the others are cancelled
+    """
+    if limiter is None:
+        limiter = TokenLimiter(max_interval=delay)
+    pages = asyncio.Queue(maxsize=len(queries))
+
+    async def run(query: str) -> None:
+        try:
+            async for page in acrawl(query, max_results=max_results, max_retries=max_retries, limiter=limiter):
+                await pages.put((query, *page))
+        except Exception as e:
+            await pages.put(e)
+        else:
+            # Marks the end of this query's pages
+            await pages.put(None)
+
+    tasks = [asyncio.create_task(run(query)) for query in queries]
+    try:
+        running = len(tasks)
+        while running:
+            item = await pages.get()
+            if item is None:
+                running -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def aget_follower_count(identifier: str, by_username: bool = False) -> Tuple[Dict[str, Any], x.RateLimit]:
+    """Get follower count for a user by ID or username.
+
+    Async counterpart of survival.x.get_follower_count, with the same
+    arguments and return value.
+
+    Raises:
+        ValueError: If SURVIVAL_X_API_TOKEN is not set or no user is found
+        httpx.HTTPStatusError: If API request fails
+    """
+    headers = x._auth_headers()
+    params = x._follower_params(identifier, by_username)
+
+    response = await get_client().get(x.USERS_URL, headers=headers, params=params)
+    response.raise_for_status()
+
+    rate_limit = x._rate_limit(response.headers)
+
+    result = jsonl.loads(response.content)
+    users = result.get("data", [])
+
+    if not users:
+        raise ValueError(f"No user found with {'username' if by_username else 'ID'}: {identifier}")
+
+    return users[0], rate_limit
+
+async def aget_users_batch(user_ids: List[str]) -> Tuple[List[Dict[str, Any]], x.RateLimit]:
+    """Get information for multiple users in a single request.
+
+    Async counterpart of survival.x.get_users_batch, with the same
+    arguments and return value. More than MAX_BATCH_IDS IDs are split into
+    requests made concurrently, and the rate limit info with the fewest
+    remaining requests is returned.
+
+    Raises:
+        ValueError: If SURVIVAL_X_API_TOKEN is not set
+        httpx.HTTPStatusError: If API request fails
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if len(user_ids) > x.MAX_BATCH_IDS:
+        results = await asyncio.gather(*(
+            aget_users_batch(user_ids[i:i + x.MAX_BATCH_IDS])
+            for i in range(0, len(user_ids), x.MAX_BATCH_IDS)
+        ))
+        users = [user for batch, _ in results for user in batch]
+        rate_limit = min((rate_limit for _, rate_limit in results), key=lambda r: r.remaining)
+        return users, rate_limit
+
+    headers = x._auth_headers()
+    params = x._users_batch_params(user_ids)
+
+    response = await get_client().get(x.USERS_URL, headers=headers, params=params)
+    response.raise_for_status()
+
+    rate_limit = x._rate_limit(response.headers)
+
+    result = jsonl.loads(response.content)
+    return result.get("data", []), rate_limit
+
+async def aget_users_batch_many(
+    id_batches: List[List[str]],
+    concurrency: int = MAX_CONCURRENCY
+) -> List[Tuple[List[Dict[str, Any]], x.RateLimit]]:
+    """Look up several batches of users concurrently.
+
+    Args:
+        id_batches: Lists of user IDs, each looked up with aget_users_batch
+        concurrency: Maximum number of requests in flight at once
+
+    Returns:
+        One (users, rate_limit) tuple per batch, in the order given
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def lookup(user_ids: List[str]) -> Tuple[List[Dict[str, Any]], x.RateLimit]:
+        async with semaphore:
+            return await aget_users_batch(user_ids)
+
+    return await asyncio.gather(*(lookup(batch) for batch in id_batches))